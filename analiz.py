@@ -10,9 +10,15 @@ Tanımlar:
     - Kullanılabilirlik = (Planlı Süre − Arıza Süresi) / Planlı Süre
     - Performans        = Gerçek Üretim / Teorik Kapasite
     - Kalite            = (Toplam Üretim − Fire) / Toplam Üretim
+
+Planlı süre, teorik kapasite ve fire eşiği hat veya makine bazında
+ayrı ayrı verilebilir; `senaryo_simulasyonu` ile birden çok parametre
+senaryosu aynı veri üzerinde tek geçişte değerlendirilir.
 """
 
+import itertools
 import sqlite3
+import numpy as np
 import pandas as pd
 
 
@@ -21,6 +27,12 @@ PLANLI_CALISMA_SURESI_DK = 480  # 8 saatlik vardiya (dakika)
 TEORIK_KAPASITE_KG = 2200       # Makine başı ideal günlük kapasite (kg)
 FIRE_ESIK_YUZDESI = 5.0         # %5 üzeri fire → Kritik
 
+VARSAYILAN_PARAMETRELER = {
+    "planli_calisma_suresi_dk": PLANLI_CALISMA_SURESI_DK,
+    "teorik_kapasite_kg": TEORIK_KAPASITE_KG,
+    "fire_esik_yuzdesi": FIRE_ESIK_YUZDESI,
+}
+
 
 def veri_cek(db_yolu: str = "uretim.db") -> pd.DataFrame:
     """Veritabanından tüm üretim verilerini Pandas DataFrame olarak döndürür."""
@@ -31,25 +43,71 @@ def veri_cek(db_yolu: str = "uretim.db") -> pd.DataFrame:
     return df
 
 
-def oee_hesapla(df: pd.DataFrame) -> pd.DataFrame:
+def parametreleri_coz(
+    df: pd.DataFrame,
+    hat_parametreleri: dict | None = None,
+    makine_parametreleri: dict | None = None,
+) -> pd.DataFrame:
     """
-    Her satır için OEE bileşenlerini hesaplar ve DataFrame'e ekler.
-    Dönen sütunlar: kullanilabilirlik, performans, kalite, oee, fire_orani, durum
+    Her satır için geçerli OEE parametrelerini döndürür.
+    Öncelik sırası: makine parametresi > hat parametresi > varsayılan sabit.
+
+    Örnek:
+        hat_parametreleri    = {"Hat-A": {"teorik_kapasite_kg": 2500}}
+        makine_parametreleri = {"M-102": {"fire_esik_yuzdesi": 8.0}}
     """
-    df = df.copy()
+    parametreler = pd.DataFrame(index=df.index)
+    for ad, varsayilan in VARSAYILAN_PARAMETRELER.items():
+        deger = pd.Series(float(varsayilan), index=df.index)
+        for sutun, tablo in (("uretim_hatti", hat_parametreleri),
+                             ("makine_no", makine_parametreleri)):
+            if not tablo:
+                continue
+            eslesme = {anahtar: p[ad] for anahtar, p in tablo.items() if ad in p}
+            if eslesme:
+                ozel = df[sutun].map(eslesme).astype(float)
+                deger = ozel.fillna(deger)
+        parametreler[ad] = deger
+    return parametreler
 
-    # Kullanılabilirlik
-    df["kullanilabilirlik"] = (
-        (PLANLI_CALISMA_SURESI_DK - df["ariza_suresi"]) / PLANLI_CALISMA_SURESI_DK
-    ).clip(0, 1)
 
-    # Performans
-    df["performans"] = (df["toplam_uretim"] / TEORIK_KAPASITE_KG).clip(0, 1)
+def _oee_bilesenleri(ariza, uretim, fire, planli_sure, kapasite):
+    """
+    OEE bileşenlerini NumPy dizileri üzerinde hesaplar.
+    Girdiler birbirine yayınlanabilir (broadcast) olmalıdır; senaryo × satır
+    şeklindeki hesaplamalar da aynı fonksiyonla yapılır.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kullanilabilirlik = np.clip((planli_sure - ariza) / planli_sure, 0, 1)
+        performans = np.clip(uretim / kapasite, 0, 1)
+        kalite = np.clip((uretim - fire) / uretim, 0, 1)
+    return kullanilabilirlik, performans, kalite
+
+
+def oee_hesapla(
+    df: pd.DataFrame,
+    hat_parametreleri: dict | None = None,
+    makine_parametreleri: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Her satır için OEE bileşenlerini hesaplar ve DataFrame'e ekler.
+    Parametre verilmezse modül sabitleri kullanılır (bkz. `parametreleri_coz`).
+    Dönen sütunlar: kullanilabilirlik, performans, kalite, oee, fire_orani,
+    fire_esik_yuzdesi, durum
+    """
+    df = df.copy()
+    parametreler = parametreleri_coz(df, hat_parametreleri, makine_parametreleri)
 
-    # Kalite
-    df["kalite"] = (
-        (df["toplam_uretim"] - df["fire_miktari"]) / df["toplam_uretim"]
-    ).clip(0, 1)
+    kullanilabilirlik, performans, kalite = _oee_bilesenleri(
+        df["ariza_suresi"].to_numpy(dtype=float),
+        df["toplam_uretim"].to_numpy(dtype=float),
+        df["fire_miktari"].to_numpy(dtype=float),
+        parametreler["planli_calisma_suresi_dk"].to_numpy(),
+        parametreler["teorik_kapasite_kg"].to_numpy(),
+    )
+    df["kullanilabilirlik"] = kullanilabilirlik
+    df["performans"] = performans
+    df["kalite"] = kalite
 
     # OEE
     df["oee"] = df["kullanilabilirlik"] * df["performans"] * df["kalite"]
@@ -57,16 +115,36 @@ def oee_hesapla(df: pd.DataFrame) -> pd.DataFrame:
     # Fire oranı (%)
     df["fire_orani"] = (df["fire_miktari"] / df["toplam_uretim"] * 100).round(2)
 
-    # Durum etiketleme
-    df["durum"] = df["fire_orani"].apply(
-        lambda x: "Kritik" if x > FIRE_ESIK_YUZDESI else "Normal"
-    )
+    # Durum etiketleme (satırın kendi eşiğine göre)
+    df["fire_esik_yuzdesi"] = parametreler["fire_esik_yuzdesi"]
+    df["durum"] = np.where(df["fire_orani"] > df["fire_esik_yuzdesi"], "Kritik", "Normal")
 
     return df
 
 
+def _parametre_adlarini_dogrula(adlar) -> None:
+    """VARSAYILAN_PARAMETRELER dışında kalan parametre adları için ValueError fırlatır."""
+    bilinmeyen = set(adlar) - set(VARSAYILAN_PARAMETRELER)
+    if bilinmeyen:
+        raise ValueError(f"Bilinmeyen parametre(ler): {', '.join(sorted(bilinmeyen))}")
+
+
+def _makine_esiklerini_dogrula(tutarsiz_makineler) -> None:
+    """Birden fazla fire eşiğine çözümlenen makineler için ValueError fırlatır."""
+    if len(tutarsiz_makineler):
+        raise ValueError(
+            "Makine(ler) için birden fazla fire eşiği çözümlendi: "
+            f"{', '.join(sorted(tutarsiz_makineler))}"
+        )
+
+
 def makine_bazli_ozet(df: pd.DataFrame) -> pd.DataFrame:
-    """Makine bazlı ortalama OEE ve fire oranı özetini döndürür."""
+    """
+    Makine bazlı ortalama OEE ve fire oranı özetini döndürür.
+    Durum, makinenin ortalama fire oranı kendi fire eşiğiyle karşılaştırılarak
+    belirlenir; bir makinenin kayıtları farklı eşiklere çözümlenmişse
+    (ör. farklı eşikli iki hatta görünüyorsa) ValueError fırlatılır.
+    """
     ozet = (
         df.groupby("makine_no")
         .agg(
@@ -81,19 +159,120 @@ def makine_bazli_ozet(df: pd.DataFrame) -> pd.DataFrame:
     )
     ozet["ortalama_oee"] = (ozet["ortalama_oee"] * 100).round(2)
     ozet["ortalama_fire_orani"] = ozet["ortalama_fire_orani"].round(2)
-    ozet["durum"] = ozet["ortalama_fire_orani"].apply(
-        lambda x: "Kritik" if x > FIRE_ESIK_YUZDESI else "Normal"
-    )
+    if "fire_esik_yuzdesi" in df.columns:
+        esik_grup = df.groupby("makine_no")["fire_esik_yuzdesi"]
+        farkli = esik_grup.nunique()
+        _makine_esiklerini_dogrula(farkli.index[farkli > 1])
+        esik = esik_grup.first().reindex(ozet["makine_no"]).to_numpy()
+    else:
+        esik = FIRE_ESIK_YUZDESI
+    ozet["durum"] = np.where(ozet["ortalama_fire_orani"] > esik, "Kritik", "Normal")
     return ozet
 
 
 def anormallik_raporu(df: pd.DataFrame) -> pd.DataFrame:
-    """Fire oranı %5'in üzerinde olan kayıtları 'Anormallik Raporu' olarak döndürür."""
+    """Fire oranı eşiği aşan kayıtları 'Anormallik Raporu' olarak döndürür (varsayılan eşik %5)."""
     kritik = df[df["durum"] == "Kritik"].copy()
     kritik = kritik.sort_values(["fire_orani"], ascending=False)
     return kritik
 
 
+def senaryo_izgarasi(**eksenler) -> pd.DataFrame:
+    """
+    Verilen parametre değerlerinin tüm kombinasyonlarından senaryo tablosu üretir.
+
+    Örnek:
+        senaryo_izgarasi(teorik_kapasite_kg=[2000, 2200, 2400],
+                         fire_esik_yuzdesi=[4.0, 5.0, 6.0])   # 9 senaryo
+    """
+    _parametre_adlarini_dogrula(eksenler)
+    kombinasyonlar = list(itertools.product(*eksenler.values()))
+    return pd.DataFrame(kombinasyonlar, columns=list(eksenler))
+
+
+def _satir_ortalamasi(matris: np.ndarray) -> np.ndarray:
+    """Satır bazında NaN'ları atlayarak ortalama alır (pandas `mean` ile aynı davranış)."""
+    gecerli = ~np.isnan(matris)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(gecerli, matris, 0).sum(axis=1) / gecerli.sum(axis=1)
+
+
+def senaryo_simulasyonu(
+    df: pd.DataFrame,
+    senaryolar: pd.DataFrame,
+    hat_parametreleri: dict | None = None,
+    makine_parametreleri: dict | None = None,
+) -> pd.DataFrame:
+    """
+    Parametre senaryolarını aynı veri üzerinde tek seferde değerlendirir.
+
+    `senaryolar` içindeki her satır bir senaryodur; sütunları
+    VARSAYILAN_PARAMETRELER anahtarlarından oluşur. Senaryoda verilmeyen
+    (sütun yok ya da NaN) parametreler için hat/makine/varsayılan değerler
+    kullanılır. Hesaplama senaryo × satır boyutunda tek bir NumPy
+    yayınlaması (broadcast) ile yapılır. Makine bazlı durum
+    `makine_bazli_ozet` ile aynıdır: bir senaryoda makinenin kayıtları
+    farklı fire eşiklerine çözümlenirse ValueError fırlatılır.
+
+    Dönen tablo: senaryo parametreleri + ortalama_oee, ortalama_kullanilabilirlik,
+    ortalama_performans, ortalama_kalite (%), kritik_kayit_sayisi,
+    kritik_makine_sayisi
+    """
+    _parametre_adlarini_dogrula(senaryolar.columns)
+    if df.empty:
+        raise ValueError("Simülasyon için en az bir üretim kaydı gereklidir.")
+
+    temel = parametreleri_coz(df, hat_parametreleri, makine_parametreleri)
+
+    # (senaryo, satır) matrisleri: senaryo değeri yoksa satırın kendi parametresi
+    matris = {}
+    for ad in VARSAYILAN_PARAMETRELER:
+        satir_degeri = temel[ad].to_numpy()[np.newaxis, :]
+        if ad in senaryolar.columns:
+            senaryo_degeri = senaryolar[ad].to_numpy(dtype=float)[:, np.newaxis]
+            matris[ad] = np.where(np.isnan(senaryo_degeri), satir_degeri, senaryo_degeri)
+        else:
+            matris[ad] = np.broadcast_to(satir_degeri, (len(senaryolar), len(df)))
+
+    uretim = df["toplam_uretim"].to_numpy(dtype=float)
+    fire = df["fire_miktari"].to_numpy(dtype=float)
+    kullanilabilirlik, performans, kalite = _oee_bilesenleri(
+        df["ariza_suresi"].to_numpy(dtype=float)[np.newaxis, :],
+        uretim[np.newaxis, :],
+        fire[np.newaxis, :],
+        matris["planli_calisma_suresi_dk"],
+        matris["teorik_kapasite_kg"],
+    )
+    kullanilabilirlik, performans, kalite = np.broadcast_arrays(
+        kullanilabilirlik, performans, kalite
+    )
+    oee = kullanilabilirlik * performans * kalite
+
+    # Fire oranı senaryodan bağımsızdır; yalnızca eşik değişir
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fire_orani = np.round(fire / uretim * 100, 2)
+    esik = matris["fire_esik_yuzdesi"]
+    kritik_kayit = (fire_orani[np.newaxis, :] > esik).sum(axis=1)
+
+    # Makine bazlı durum: ortalama fire oranı (NaN kayıtlar atlanır) makinenin
+    # tek fire eşiğiyle karşılaştırılır
+    kodlar, makineler = pd.factorize(df["makine_no"], sort=True)
+    farkli = pd.DataFrame(esik.T).groupby(kodlar).nunique().gt(1).any(axis=1)
+    _makine_esiklerini_dogrula(makineler[farkli.to_numpy()])
+    makine_fire = pd.Series(fire_orani).groupby(kodlar).mean().round(2).to_numpy()
+    ilk_satir = pd.Series(np.arange(len(df))).groupby(kodlar).first().to_numpy()
+    kritik_makine = (makine_fire[np.newaxis, :] > esik[:, ilk_satir]).sum(axis=1)
+
+    sonuc = senaryolar.reset_index(drop=True).copy()
+    sonuc["ortalama_oee"] = (_satir_ortalamasi(oee) * 100).round(2)
+    sonuc["ortalama_kullanilabilirlik"] = (_satir_ortalamasi(kullanilabilirlik) * 100).round(2)
+    sonuc["ortalama_performans"] = (_satir_ortalamasi(performans) * 100).round(2)
+    sonuc["ortalama_kalite"] = (_satir_ortalamasi(kalite) * 100).round(2)
+    sonuc["kritik_kayit_sayisi"] = kritik_kayit
+    sonuc["kritik_makine_sayisi"] = kritik_makine
+    return sonuc
+
+
 if __name__ == "__main__":
     veriler = veri_cek()
     analiz = oee_hesapla(veriler)
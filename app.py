@@ -456,7 +456,8 @@ with dl2:
 
 # Ham veri
 with st.expander("Detaylı Veri Tablosu", expanded=False):
-    st.dataframe(df, width="stretch", height=400)
+    # fire_esik_yuzdesi yalnızca durum hesabı içindir; tabloda gösterilmez
+    st.dataframe(df.drop(columns=["fire_esik_yuzdesi"]), width="stretch", height=400)
 
 # Footer
 st.markdown("""
@@ -0,0 +1,147 @@
+"""analiz.py için testler: parametre önceliği ve senaryo simülasyonunun pipeline ile uyumu."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analiz import (
+    VARSAYILAN_PARAMETRELER,
+    anormallik_raporu,
+    makine_bazli_ozet,
+    oee_hesapla,
+    parametreleri_coz,
+    senaryo_izgarasi,
+    senaryo_simulasyonu,
+    veri_cek,
+)
+from veritabani_olustur import veritabani_olustur
+
+
+@pytest.fixture
+def veriler(tmp_path):
+    random.seed(26)
+    db_yolu = str(tmp_path / "uretim.db")
+    veritabani_olustur(db_yolu)
+    return veri_cek(db_yolu)
+
+
+@pytest.fixture
+def sifir_uretimli(veriler):
+    """İlk kaydı tüm vardiya duruşta (sıfır üretim) olan veri seti."""
+    df = veriler.copy()
+    df.loc[df.index[0], ["toplam_uretim", "fire_miktari"]] = 0
+    return df
+
+
+def _pipeline_ozeti(df, senaryo, hat_parametreleri=None, makine_parametreleri=None):
+    """Bir senaryoyu oee_hesapla + makine_bazli_ozet ile değerlendirir."""
+    senaryo = {ad: deger for ad, deger in senaryo.items() if not pd.isna(deger)}
+    # Senaryo değerleri hat/makine parametrelerinin önüne geçer
+    hatlar = {
+        hat: {**(hat_parametreleri or {}).get(hat, {}), **senaryo}
+        for hat in df["uretim_hatti"].unique()
+    }
+    makineler = {
+        makine: {**p, **senaryo} for makine, p in (makine_parametreleri or {}).items()
+    }
+    analiz = oee_hesapla(df, hatlar, makineler)
+    ozet = makine_bazli_ozet(analiz)
+    return {
+        "ortalama_oee": round(analiz["oee"].mean() * 100, 2),
+        "ortalama_kullanilabilirlik": round(analiz["kullanilabilirlik"].mean() * 100, 2),
+        "ortalama_performans": round(analiz["performans"].mean() * 100, 2),
+        "ortalama_kalite": round(analiz["kalite"].mean() * 100, 2),
+        "kritik_kayit_sayisi": (analiz["durum"] == "Kritik").sum(),
+        "kritik_makine_sayisi": (ozet["durum"] == "Kritik").sum(),
+    }
+
+
+def _uyumu_dogrula(df, senaryolar, **parametreler):
+    sonuc = senaryo_simulasyonu(df, senaryolar, **parametreler)
+    assert len(sonuc) == len(senaryolar)
+    for i, senaryo in senaryolar.iterrows():
+        beklenen = _pipeline_ozeti(df, senaryo.to_dict(), **parametreler)
+        for sutun, deger in beklenen.items():
+            assert sonuc.loc[i, sutun] == pytest.approx(deger), (i, sutun)
+
+
+def test_oee_hesapla_varsayilan_formul(veriler):
+    analiz = oee_hesapla(veriler)
+    kullanilabilirlik = ((480 - veriler["ariza_suresi"]) / 480).clip(0, 1)
+    performans = (veriler["toplam_uretim"] / 2200).clip(0, 1)
+    kalite = ((veriler["toplam_uretim"] - veriler["fire_miktari"]) / veriler["toplam_uretim"]).clip(0, 1)
+    assert np.allclose(analiz["oee"], kullanilabilirlik * performans * kalite)
+    assert (anormallik_raporu(analiz)["fire_orani"] > 5.0).all()
+
+
+def test_parametre_onceligi_makine_hat_varsayilan(veriler):
+    hat_parametreleri = {"Hat-A": {"teorik_kapasite_kg": 2500, "fire_esik_yuzdesi": 6.0}}
+    makine_parametreleri = {"M-102": {"fire_esik_yuzdesi": 8.0}}
+    parametreler = parametreleri_coz(veriler, hat_parametreleri, makine_parametreleri)
+
+    m102 = veriler["makine_no"] == "M-102"
+    hat_a = (veriler["uretim_hatti"] == "Hat-A") & ~m102
+    diger = veriler["uretim_hatti"] != "Hat-A"
+    assert m102.any() and hat_a.any() and diger.any()
+
+    assert (parametreler.loc[m102, "fire_esik_yuzdesi"] == 8.0).all()
+    assert (parametreler.loc[m102, "teorik_kapasite_kg"] == 2500).all()
+    assert (parametreler.loc[hat_a, "fire_esik_yuzdesi"] == 6.0).all()
+    for ad, varsayilan in VARSAYILAN_PARAMETRELER.items():
+        assert (parametreler.loc[diger, ad] == varsayilan).all()
+
+
+def test_senaryo_izgarasi_tum_kombinasyonlar():
+    izgara = senaryo_izgarasi(teorik_kapasite_kg=[2000, 2200], fire_esik_yuzdesi=[4.0, 5.0, 6.0])
+    assert len(izgara) == 6
+    assert list(izgara.columns) == ["teorik_kapasite_kg", "fire_esik_yuzdesi"]
+
+
+def test_senaryo_izgarasi_bilinmeyen_parametre():
+    with pytest.raises(ValueError, match="Bilinmeyen"):
+        senaryo_izgarasi(hiz=[1, 2])
+
+
+def test_simulasyon_izgara_pipeline_ile_uyumlu(veriler):
+    senaryolar = senaryo_izgarasi(
+        planli_calisma_suresi_dk=[420, 480],
+        teorik_kapasite_kg=[2000, 2400],
+        fire_esik_yuzdesi=[4.0, 6.0, np.nan],
+    )
+    _uyumu_dogrula(
+        veriler,
+        senaryolar,
+        hat_parametreleri={"Hat-B": {"teorik_kapasite_kg": 1800}},
+        makine_parametreleri={"M-102": {"fire_esik_yuzdesi": 8.0}},
+    )
+
+
+def test_simulasyon_sifir_uretimli_kayit(sifir_uretimli):
+    senaryolar = senaryo_izgarasi(teorik_kapasite_kg=[2200, 2400], fire_esik_yuzdesi=[4.0, 5.0])
+    with np.errstate(all="raise"):
+        _uyumu_dogrula(sifir_uretimli, senaryolar)
+    sonuc = senaryo_simulasyonu(sifir_uretimli, senaryolar)
+    assert sonuc["ortalama_oee"].notna().all()
+    assert sonuc["ortalama_kalite"].notna().all()
+
+
+def test_simulasyon_bos_veri(veriler):
+    with pytest.raises(ValueError):
+        senaryo_simulasyonu(veriler.iloc[:0], senaryo_izgarasi(teorik_kapasite_kg=[2200]))
+
+
+def test_makine_icin_farkli_esikler_reddedilir(veriler):
+    df = veriler.copy()
+    m102 = df.index[df["makine_no"] == "M-102"]
+    df.loc[m102[0], "uretim_hatti"] = "Hat-B"
+    hat_parametreleri = {"Hat-A": {"fire_esik_yuzdesi": 4.0}, "Hat-B": {"fire_esik_yuzdesi": 6.0}}
+
+    with pytest.raises(ValueError, match="M-102"):
+        makine_bazli_ozet(oee_hesapla(df, hat_parametreleri))
+    with pytest.raises(ValueError, match="M-102"):
+        senaryo_simulasyonu(df, senaryo_izgarasi(teorik_kapasite_kg=[2200]), hat_parametreleri)
+
+    # Senaryo eşiği tüm kayıtlara uygulandığında çakışma kalmaz
+    senaryo_simulasyonu(df, senaryo_izgarasi(fire_esik_yuzdesi=[5.0]), hat_parametreleri)